@@ -1,9 +1,11 @@
 import logging
-from balancebook.csv import CsvFile, load_csv, write_csv, CsvColumn
+from balancebook.csv import CsvFile, iter_csv, write_csv, CsvColumn
 import balancebook.errors as bberr
 from balancebook.errors import SourcePosition
 from balancebook.i18n import I18n
 from enum import Enum
+from operator import attrgetter
+from typing import Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -16,25 +18,32 @@ class AccountType(Enum):
     EXPENSES = 5
 
     def __str__(self):
-        # Capitalize the first letter
-        return self.name[0] + self.name[1:].lower()
+        return _account_type_str[self]
+
+# Computed once, the name with only the first letter capitalized
+_account_type_str = dict([(t, t.name[0] + t.name[1:].lower()) for t in AccountType])
+
+# Valid range of account numbers and the error raised outside of it, for each account type
+_account_type_ranges = dict([(t, (t.value * 1000, t.value * 1000 + 999)) for t in AccountType])
+_account_type_number_error = {AccountType.ASSETS: bberr.AssetsNumberInvalid,
+                              AccountType.LIABILITIES: bberr.LiabilitiesNumberInvalid,
+                              AccountType.EQUITY: bberr.EquityNumberInvalid,
+                              AccountType.INCOME: bberr.IncomeNumberInvalid,
+                              AccountType.EXPENSES: bberr.ExpensesNumberInvalid}
 
 def valid_account_type_number(number: int, type: AccountType) -> bool:
     """Check if the account number is valid for the account type"""
-    if type == AccountType.ASSETS:
-        return number >= 1000 and number <= 1999
-    elif type == AccountType.LIABILITIES:
-        return number >= 2000 and number <= 2999
-    elif type == AccountType.EQUITY:
-        return number >= 3000 and number <= 3999
-    elif type == AccountType.INCOME:
-        return number >= 4000 and number <= 4999
-    elif type == AccountType.EXPENSES:
-        return number >= 5000 and number <= 5999
-    else:
+    bounds = _account_type_ranges.get(type)
+    if bounds is None:
         return False
+    lo, hi = bounds
+    return lo <= number <= hi
 
 class Account():
+    __slots__ = ("identifier", "name", "number", "parent", "children",
+                 "description", "source", "__account_type__",
+                 "_account_type_cache", "_depth_cache")
+
     def __init__(self, identifier: str, name: str, number: int, 
                  parent: 'Account', children: list['Account'] = None,
                  description: str = None, source: SourcePosition = None):
@@ -46,6 +55,9 @@ class Account():
         self.description = description
         self.source = source
         self.__account_type__ = None
+        # Computed on first use, once the hierarchy is built
+        self._account_type_cache = None
+        self._depth_cache = None
 
     def __str__(self):
         return f"Account({self.identifier})"
@@ -60,17 +72,22 @@ class Account():
         return hash(self.number)
     
     def account_type(self):
-        if self.parent:
-            return self.parent.account_type()
-        else:
-            return self.__account_type__
+        if self._account_type_cache is None:
+            acc = self
+            while acc.parent:
+                acc = acc.parent
+            self._account_type_cache = acc.__account_type__
+        return self._account_type_cache
 
     def get_descendants(self) -> list['Account']:
         """Return a list of all children, grand-children, etc."""
+        # Depth-first, children in order, with an explicit stack
         children = []
-        for c in self.children:
+        stack = self.children[::-1]
+        while stack:
+            c = stack.pop()
             children.append(c)
-            children.extend(c.get_descendants())
+            stack.extend(c.children[::-1])
         return children
     
     def get_account_and_descendants(self) -> list['Account']:
@@ -82,19 +99,23 @@ class Account():
     def depth(self) -> int:
         """Return the depth of the account in the hierarchy.
         Starts at 1 for the top accounts"""
-        if self.parent:
-            return self.parent.depth() + 1
-        else:
-            return 1
+        if self._depth_cache is None:
+            depth = 1
+            parent = self.parent
+            while parent:
+                depth += 1
+                parent = parent.parent
+            self._depth_cache = depth
+        return self._depth_cache
 
     def get_parents(self) -> list['Account']:
         """Return a list of all parents, grand-parents, etc."""
-        if self.parent:
-            ls = [self.parent]
-            ls.extend(self.parent.get_parents())
-            return ls
-        else:
-            return []
+        ls = []
+        parent = self.parent
+        while parent:
+            ls.append(parent)
+            parent = parent.parent
+        return ls
 
     def get_account_and_parents(self) -> list['Account']:
         """Return this account, a list of all parents, grand-parents, etc."""
@@ -105,16 +126,18 @@ class Account():
     def get_leaves(self) -> list['Account']:
         """Return a list of all leaves of the tree"""
         leaves = []
-        if len(self.children) == 0:
-            leaves.append(self)
-        else:
-            for c in self.children:
-                leaves.extend(c.get_leaves())
+        stack = [self]
+        while stack:
+            acc = stack.pop()
+            if acc.children:
+                stack.extend(acc.children[::-1])
+            else:
+                leaves.append(acc)
         return leaves
     
     def sort_children(self) -> None:
         """Sort children by account number"""
-        self.children.sort(key=lambda a: a.number)
+        self.children.sort(key=attrgetter("number"))
         for c in self.children:
             c.sort_children()
 
@@ -132,52 +155,42 @@ def load_accounts(csvFile: CsvFile, i18n: I18n = None) -> ChartOfAccounts:
     if i18n is None:
         i18n = I18n()
 
+    return build_chart_of_accounts(list(iter_accounts(csvFile, i18n)), i18n)
+
+def iter_accounts(csvFile: CsvFile, i18n: I18n = None) -> Iterator[Account]:
+    """Yield the accounts of the cvs file one at a time, as they are read.
+    
+    The accounts are not verified and their parent is still the parent identifier."""
+    if i18n is None:
+        i18n = I18n()
+
     identifier_i18n = i18n["Identifier"]
     name_i18n = i18n["Name"]
     number_i18n = i18n["Number"]
     parent_i18n = i18n["Parent"]
     description_i18n = i18n["Description"]
     
-    csv_rows = load_csv(csvFile, [CsvColumn(identifier_i18n, "str", True, True), 
+    csv_rows = iter_csv(csvFile, [CsvColumn(identifier_i18n, "str", True, True), 
                                   CsvColumn(name_i18n, "str", False, False), 
                                   CsvColumn(number_i18n, "int", True, True), 
                                   CsvColumn(parent_i18n, "str", True, False),
                                   CsvColumn(description_i18n, "str", False, False)],
                                   warn_extra_columns=True)
-    accounts = []
-    for row, source in csv_rows:
-        identifier = row[identifier_i18n]
-        name = row[name_i18n] if row[name_i18n] else identifier
-        acc = Account(identifier, name, row[number_i18n], row[parent_i18n], [], row[description_i18n], source)
-        accounts.append(acc)
-    
-    return build_chart_of_accounts(accounts, i18n)
+    for (identifier, name, number, parent, description), source in csv_rows:
+        yield Account(identifier, name if name else identifier, number, parent, [], description, source)
 
 def initialize_chart_of_accounts(i18n: I18n = None) -> ChartOfAccounts:
     if i18n is None:
         i18n = I18n()
 
-    a = i18n[str(AccountType.ASSETS)]
-    assets = Account(a, a, 1000, None)
-    assets.__account_type__ = AccountType.ASSETS
-
-    l = i18n[str(AccountType.LIABILITIES)]
-    liabilities = Account(l, l, 2000, None)
-    liabilities.__account_type__ = AccountType.LIABILITIES
-
-    eq = i18n[str(AccountType.EQUITY)]
-    equity = Account(eq, eq, 3000, None)
-    equity.__account_type__ = AccountType.EQUITY
-
-    i = i18n[str(AccountType.INCOME)]
-    income = Account(i, i, 4000, None)
-    income.__account_type__ = AccountType.INCOME
+    top_accounts = []
+    for t in AccountType:
+        identifier = i18n[str(t)]
+        acc = Account(identifier, identifier, t.value * 1000, None)
+        acc.__account_type__ = t
+        top_accounts.append(acc)
 
-    e = i18n[str(AccountType.EXPENSES)]
-    expenses = Account(e, e, 5000, None)
-    expenses.__account_type__ = AccountType.EXPENSES
-
-    return (assets, liabilities, equity, income, expenses)
+    return tuple(top_accounts)
 
 def build_chart_of_accounts(accounts: list[Account], i18n: I18n = None) -> ChartOfAccounts:
     """Build the chart of accounts from the list of accounts.
@@ -195,54 +208,59 @@ def build_chart_of_accounts(accounts: list[Account], i18n: I18n = None) -> Chart
 
     # Check if the user redefined the reserved account identifiers
     # This allows for specifying the account number, account name, account description of the top accounts
+    top_identifiers = dict([(i18n[str(t)], (i, t)) for i, t in enumerate(AccountType)])
     without_top_accounts: list[Account] = []
     for acc in accounts:
-        top_account = False
-        for i, t in enumerate(AccountType):
-            if acc.identifier == i18n[str(t)]:
-                if acc.parent:
-                    raise bberr.ReservedAccountId(acc.identifier, acc.source)
-                if not valid_account_type_number(acc.number, t):
-                    raise bberr.AssetsNumberInvalid(acc.number, acc.source)
-                acc.__account_type__ = t
-                chart_of_accounts[i] = acc
-                top_account = True
-                break
-
-        if not top_account:
+        top = top_identifiers.get(acc.identifier)
+        if top is None:
             without_top_accounts.append(acc)
+            continue
+
+        i, t = top
+        if acc.parent:
+            raise bberr.ReservedAccountId(acc.identifier, acc.source)
+        if not valid_account_type_number(acc.number, t):
+            raise _account_type_number_error[t](acc.number, acc.source)
+        acc.__account_type__ = t
+        chart_of_accounts[i] = acc
 
     # Double check top accounts numbers are not duplicated
-    top_numbers = [a.number for a in chart_of_accounts]
-    for n in top_numbers:
-        for a in without_top_accounts:
-            if a.number == n:
-                raise bberr.AccountNumberReserved(a.number, a.source)
+    top_numbers = set([a.number for a in chart_of_accounts])
+    for a in without_top_accounts:
+        if a.number in top_numbers:
+            raise bberr.AccountNumberReserved(a.number, a.source)
 
     with_top_accounts: list[Account] = chart_of_accounts.copy()
     with_top_accounts.extend(without_top_accounts)
     account_by_id_dict = dict([(a.identifier, a) for a in with_top_accounts])
     
-    # Set the parent of each account
+    # Set the parent of each account and add the account to the children of its parent
     for acc in without_top_accounts:
         if not acc.parent:
             raise bberr.ParentAccountNotSpecified(acc.identifier, acc.source)
-        if acc.parent not in account_by_id_dict:
+        parent = account_by_id_dict.get(acc.parent)
+        if parent is None:
             raise bberr.ParentAccountNotFound(acc.parent, acc.source)
-        acc.parent = account_by_id_dict[acc.parent]
-    
-    # Set the children of each account
-    for acc in without_top_accounts:
-        acc.parent.children.append(acc)
-
-    # Verify we don't have a cycle in the account hierarchy
-    for acc in with_top_accounts:
-        if acc.parent:
+        acc.parent = parent
+        parent.children.append(acc)
+
+    # Verify we don't have a cycle in the account hierarchy.
+    # Every account must be reachable from one of the top accounts.
+    reachable = set()
+    for top in chart_of_accounts:
+        reachable.update(top.get_descendants())
+    if len(reachable) != len(without_top_accounts):
+        for acc in without_top_accounts:
+            if acc in reachable:
+                continue
+            # Unreachable accounts are in a cycle or below one, report the first one in a cycle
+            seen = set()
             parent = acc.parent
-            while parent:
-                if parent == acc:
-                    raise bberr.AccountCycle(acc.identifier, acc.source)
+            while parent not in seen and parent is not acc:
+                seen.add(parent)
                 parent = parent.parent
+            if parent is acc:
+                raise bberr.AccountCycle(acc.identifier, acc.source)
 
     # Since we don't have any cycles and all provided accounts have a specified parent,
     # we know that the top accounts are the roots of the tree
@@ -256,68 +274,49 @@ def verify_accounts(accounts: list[Account]) -> None:
     - Verify the uniqueness of the account number
     - Verify the uniqueness of the account identifier"""
 
-    if len(accounts) == 0:
-        return
+    # Single pass over the accounts for both the numbers and the identifiers
+    seen_numbers = set()
+    seen_identifiers = set()
+    duplicate_numbers: list[Account] = []
+    duplicate_identifiers: list[Account] = []
+    for a in accounts:
+        if a.number in seen_numbers:
+            duplicate_numbers.append(a)
+        else:
+            seen_numbers.add(a.number)
+        if a.identifier in seen_identifiers:
+            duplicate_identifiers.append(a)
+        else:
+            seen_identifiers.add(a.identifier)
 
     # Verify the uniqueness of the account number
-    account_numbers = [a.number for a in accounts]
-    if len(account_numbers) != len(set(account_numbers)):
-        # Find the duplicate account numbers
-        accounts.sort(key=lambda a: a.number)
-        duplicate_account_numbers: list[Account] = []
-        for i in range(len(accounts)-1):
-            if accounts[i].number == accounts[i+1].number:
-                duplicate_account_numbers.append(accounts[i])
-        # FIXME should return the complete list of duplicate account identifiers
-        wrong = duplicate_account_numbers[0]
-        raise bberr.AccountNumberNotUnique(wrong.number, wrong.source)
+    if duplicate_numbers:
+        numbers = list(dict.fromkeys([a.number for a in duplicate_numbers]))
+        raise bberr.AccountNumberNotUnique(numbers, duplicate_numbers[0].source)
 
     # Verify the uniqueness of the account identifier
-    account_identifiers = [a.identifier for a in accounts]
-    if len(account_identifiers) != len(set(account_identifiers)):
-        # Find the duplicate account identifiers
-        accounts.sort(key=lambda a: a.identifier)
-        duplicate_account_identifiers: list[Account] = []
-        for i in range(len(accounts)-1):
-            if accounts[i].identifier == accounts[i+1].identifier:
-                duplicate_account_identifiers.append(accounts[i])
-        # FIXME should return the complete list of duplicate account identifiers
-        wrong = duplicate_account_identifiers[0]
-        raise bberr.AccountIdentifierNotUnique(wrong.identifier, wrong.source)
+    if duplicate_identifiers:
+        identifiers = list(dict.fromkeys([a.identifier for a in duplicate_identifiers]))
+        raise bberr.AccountIdentifierNotUnique(identifiers, duplicate_identifiers[0].source)
 
 def verify_chart_of_accounts(account: ChartOfAccounts) -> None:
     """Verify the consistency of the chart of accounts
 
     - Check that the account number is valid"""
     
-    # Check asset account number is between 1000 and 1999
-    for acc in account[0].get_descendants():
-        if not valid_account_type_number(acc.number, AccountType.ASSETS):
-            raise bberr.AssetsNumberInvalid(acc.number, acc.source)
-    
-    # Check liability account number is between 2000 and 2999
-    for acc in account[1].get_descendants():
-        if not valid_account_type_number(acc.number, AccountType.LIABILITIES):
-            raise bberr.LiabilitiesNumberInvalid(acc.number, acc.source)
-    
-    # Check equity account number is between 3000 and 3999
-    for acc in account[2].get_descendants():
-        if not valid_account_type_number(acc.number, AccountType.EQUITY):
-            raise bberr.EquityNumberInvalid(acc.number, acc.source)
-    
-    # Check income account number is between 4000 and 4999
-    for acc in account[3].get_descendants():
-        if not valid_account_type_number(acc.number, AccountType.INCOME):
-            raise bberr.IncomeNumberInvalid(acc.number, acc.source)
-    
-    # Check expense account number is between 5000 and 5999
-    for acc in account[4].get_descendants():
-        if not valid_account_type_number(acc.number, AccountType.EXPENSES):
-            raise bberr.ExpensesNumberInvalid(acc.number, acc.source)
-
-def write_chart_of_accounts(chart_of_accounts: ChartOfAccounts, csvFile: CsvFile) -> None:
+    # Check the account number is in the range of its account type,
+    # for example between 1000 and 1999 for assets
+    for t, top in zip(AccountType, account):
+        lo, hi = _account_type_ranges[t]
+        for acc in top.get_descendants():
+            if not lo <= acc.number <= hi:
+                raise _account_type_number_error[t](acc.number, acc.source)
+
+def write_chart_of_accounts(chart_of_accounts: ChartOfAccounts, csvFile: CsvFile, i18n: I18n = None) -> None:
     """Write the chart of accounts to file."""
-    accounts = write_chart_of_accounts_to_list(chart_of_accounts)
+    if i18n is None:
+        i18n = I18n()
+    accounts = write_chart_of_accounts_to_list(chart_of_accounts, i18n)
     write_csv(accounts, csvFile)
 
 def write_accounts(accs: list[Account],csvFile: CsvFile, i18n: I18n) -> None:
@@ -330,7 +329,7 @@ def write_chart_of_accounts_to_list(chart_of_accounts: ChartOfAccounts, i18n: I1
 
     rows =[]
     if header:
-        rows = [account_header]
+        rows.append([i18n[x] for x in account_header])
     for a in chart_of_accounts:
         rows.extend(write_accounts_to_list(a.get_descendants(), i18n, False))
     return rows
@@ -343,7 +342,8 @@ def write_accounts_to_list(accs: list[Account], i18n: I18n, header: bool = True)
     rows =[]
     if header:
         rows.append([i18n[x] for x in account_header])
+    append = rows.append
     for a in accs:
-        parent = a.parent.identifier if a.parent else ""
-        rows.append([a.identifier, a.name, a.number, parent, a.description])
-    return rows
\ No newline at end of file
+        parent = a.parent
+        append([a.identifier, a.name, a.number, parent.identifier if parent else "", a.description])
+    return rows
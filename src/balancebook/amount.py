@@ -1,5 +1,7 @@
 # Internal computations are done with integer to avoid rouding errors
 
+from functools import lru_cache
+
 import balancebook.errors as bberr
 from balancebook.errors import SourcePosition
 
@@ -13,8 +15,27 @@ def amount_to_float(n: int):
 
 def amount_to_str(n: int, decimal_sep: str = "."):
     """Converts an amount (integer) to a string"""
-    f = amount_to_float(n)
-    return (f"{f:.2f}").replace('.',decimal_sep)
+    # Integer arithmetic, exact for any amount
+    sign = "-" if n < 0 else ""
+    units, cents = divmod(abs(n), 100)
+    return f"{sign}{units}{decimal_sep}{cents:02d}"
+
+@lru_cache(maxsize=32)
+def _cleanup_table(decimal_sep: str, currency_sign: str, thousands_sep: str) -> dict | None:
+    """Translation table equivalent to the replace calls of any_to_amount.
+
+    None if one of the separators is more than one character long. str.translate
+    maps single characters only, so a multi-character currency sign like "CAD"
+    or separator falls back to the replace calls."""
+    table = {}
+    # Same precedence as the replace calls, a removed character is never a decimal separator
+    for sep, to in [(decimal_sep, "."), (thousands_sep, None), (currency_sign, None)]:
+        if not sep:
+            continue
+        if len(sep) > 1:
+            return None
+        table[sep] = to
+    return str.maketrans(table)
 
 def any_to_amount(s, decimal_sep: str = ".", currency_sign: str = "$", thousands_sep: str = " ",
                   source: SourcePosition = None):
@@ -22,29 +43,35 @@ def any_to_amount(s, decimal_sep: str = ".", currency_sign: str = "$", thousands
     
     1.03 $ -> 103
     (3.45) -> -345"""
-    # If s is an int, convert it to an amount
-    if isinstance(s, int):
-        return s * 100
-    
-    # If s is a float, convert it to an amount
-    if isinstance(s, float):
-        return float_to_amount(s)
-
-    # If s is a string, convert it to an amount
+    # If s is a string, convert it to an amount.
+    # Checked first since amounts read from csv files are strings
     if isinstance(s, str):
         s = s.strip()
-        if currency_sign:
-            s = s.replace(currency_sign,"")
-        if thousands_sep:
-            s = s.replace(thousands_sep,"")
-        if decimal_sep:
-            s = s.replace(decimal_sep,".")
-        if s[0] == '(' and s[-1] == ')':
+        table = _cleanup_table(decimal_sep, currency_sign, thousands_sep)
+        if table is not None:
+            s = s.translate(table)
+        else:
+            # Multi-character separators, see _cleanup_table
+            if currency_sign:
+                s = s.replace(currency_sign,"")
+            if thousands_sep:
+                s = s.replace(thousands_sep,"")
+            if decimal_sep:
+                s = s.replace(decimal_sep,".")
+        if s.startswith('(') and s.endswith(')'):
             s = "-" + s[1:-1]
 
         try:
             return float_to_amount(float(s))
         except ValueError as e:
             raise bberr.InvalidAmount(s, source) from e
+
+    # If s is an int, convert it to an amount
+    if isinstance(s, int):
+        return s * 100
+    
+    # If s is a float, convert it to an amount
+    if isinstance(s, float):
+        return float_to_amount(s)
     
-    raise bberr.InvalidAmount(s, source)
\ No newline at end of file
+    raise bberr.InvalidAmount(s, source)
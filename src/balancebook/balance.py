@@ -1,6 +1,9 @@
 import logging
 from datetime import date
-from balancebook.csv import CsvFile, load_csv, write_csv, CsvColumn
+from itertools import groupby
+from operator import attrgetter
+from typing import Iterator
+from balancebook.csv import CsvFile, iter_csv, write_csv, CsvColumn
 import balancebook.errors as bberr
 from balancebook.errors import SourcePosition
 from balancebook.account import Account
@@ -10,6 +13,8 @@ from balancebook.amount import amount_to_str
 logger = logging.getLogger(__name__)
 
 class Balance():
+    __slots__ = ("date", "account", "statement_balance", "source")
+
     def __init__(self, date: date, account: Account, statement_balance: int,
                  source: SourcePosition = None):
         self.date = date
@@ -32,6 +37,17 @@ def load_balances(csvFile: CsvFile, accounts_by_number: dict[str,Account], i18n:
     
     Verify the consistency of the balances"""
 
+    balances = list(iter_balances(csvFile, accounts_by_number, i18n))
+
+    verify_balances(balances)
+
+    return balances
+
+def iter_balances(csvFile: CsvFile, accounts_by_number: dict[str,Account], i18n: I18n = None) -> Iterator[Balance]:
+    """Yield the balances of the csv file one at a time, as they are read.
+    
+    The balances are not verified"""
+
     if i18n is None:
         i18n = I18n()
 
@@ -39,21 +55,15 @@ def load_balances(csvFile: CsvFile, accounts_by_number: dict[str,Account], i18n:
     account_i18n = i18n["Account"]
     statement_balance_i18n = i18n["Statement balance"]
     
-    csv_rows = load_csv(csvFile, [CsvColumn(date_i18n, "date", True, True), 
+    csv_rows = iter_csv(csvFile, [CsvColumn(date_i18n, "date", True, True), 
                                   CsvColumn(account_i18n, "str", True, True), 
                                   CsvColumn(statement_balance_i18n, "amount", True, True)],
                                   warn_extra_columns=True)
-    balances = []
-    for row, source in csv_rows:
-        if row[account_i18n] not in accounts_by_number:
-            raise bberr.UnknownAccount(row[account_i18n], source)
-        balances.append(Balance(row[date_i18n], 
-                                accounts_by_number[row[account_i18n]], 
-                                row[statement_balance_i18n], source))
-
-    verify_balances(balances)
-
-    return balances
+    for (dt, account, statement_balance), source in csv_rows:
+        acc = accounts_by_number.get(account)
+        if acc is None:
+            raise bberr.UnknownAccount(account, source)
+        yield Balance(dt, acc, statement_balance, source)
 
 def verify_balances(bals: list[Balance]) -> None:
     """Verify the consistency of the balances"""
@@ -74,25 +84,14 @@ def write_balances(bals: list[Balance], csvFile: CsvFile, i18n: I18n) -> None:
 def write_balances_to_list(bals: list[Balance], i18n: I18n, decimal_separator = ".") -> list[list[str]]:
     rows = []
     rows.append([i18n[x] for x in ["Date","Account","Statement balance"]])
-    for b in bals:
-       rows.append([b.date, b.account.identifier, amount_to_str(b.statement_balance, decimal_separator)])
+    rows.extend([[b.date, b.account.identifier, amount_to_str(b.statement_balance, decimal_separator)] 
+                 for b in bals])
     return rows
 
 def balance_by_account(bals: list[Balance]) -> dict[int, list[Balance]]:
     """Return a dictionary of balances by account number."""
     balance_by_account: dict[int, list[Balance]] = {}
-    if len(bals) == 0:
-        return balance_by_account
-    
-    bals = sorted(bals, key=lambda x: (x.account.number, x.date))
-    b: Balance = bals[0]
-    balance_by_account[b.account.number] = [b]
-    for i in range(len(bals) - 1):
-        nextB = bals[i+1]
-        previous: Account = bals[i].account
-        next: Account = nextB.account
-        if previous != next:
-            balance_by_account[next.number] = [nextB]
-        else:
-            balance_by_account[next.number].append(nextB)
-    return balance_by_account
\ No newline at end of file
+    bals = sorted(bals, key=attrgetter("account.number", "date"))
+    for n, group in groupby(bals, key=attrgetter("account.number")):
+        balance_by_account[n] = list(group)
+    return balance_by_account
@@ -3,6 +3,8 @@ import os
 import logging
 import csv
 from datetime import date, datetime
+from typing import Iterator
+from functools import lru_cache
 
 import balancebook.errors as bberr
 from balancebook.errors import SourcePosition
@@ -10,6 +12,9 @@ from balancebook.amount import any_to_amount
 
 logger = logging.getLogger(__name__)
 
+# Read and write csv files in large chunks rather than with the default buffer size
+_buffer_size = 1 << 20
+
 class CsvConfig:
     """Configuration for CSV files."""
     def __init__(self, encoding = "utf-8", column_separator = ",", quotechar = "\"", decimal_separator = ".",
@@ -43,10 +48,15 @@ class CsvFile:
 def read_date(s: str, source: SourcePosition = None) -> date:
     """Read a date from a string in the format YYYY-MM-DD."""
     try:
-        return date.fromisoformat(s)
+        return _parse_iso_date(s)
     except ValueError as e:
         raise bberr.InvalidDateFormat(s, source) from e
 
+# The same dates come back on many rows (month ends, statement dates)
+@lru_cache(maxsize=4096)
+def _parse_iso_date(s: str) -> date:
+    return date.fromisoformat(s)
+
 def read_int(s: str, source: SourcePosition = None) -> int:
     """Read an integer from a string."""
     try:
@@ -56,31 +66,50 @@ def read_int(s: str, source: SourcePosition = None) -> int:
 
 def read_value(s: str, type: str, csv_conf: CsvConfig, source: SourcePosition = None) -> any:
     """Read a value from a string."""
+    parser = _value_parser(type, csv_conf, source)
+    return parser(s, source) if parser else s
+
+def _value_parser(type: str, csv_conf: CsvConfig, source: SourcePosition = None):
+    """Return the function reading a value of this type from a string.
+
+    The function takes the string and the source position. None for str values,
+    which are kept as is."""
     if type == "str":
-        return s
+        return None
     elif type == "int":
-        return read_int(s, source)
+        return read_int
     elif type == "date":
-        return read_date(s, source)
+        return read_date
     elif type == "amount":
-        return any_to_amount(s, csv_conf.decimal_separator, csv_conf.currency_sign, csv_conf.thousands_separator, source)
+        decimal_separator = csv_conf.decimal_separator
+        currency_sign = csv_conf.currency_sign
+        thousands_separator = csv_conf.thousands_separator
+        return lambda s, source: any_to_amount(s, decimal_separator, currency_sign, thousands_separator, source)
     elif type == "ymdate":
-        return read_yyyy_mm_date(s, source)
+        return read_yyyy_mm_date
     else:
         raise bberr.InvalidCsvType(type, source)
 
 def read_yyyy_mm_date(s: str, source: SourcePosition = None) -> date:
     """Reads a month and year from a string."""
+    dt = s.strip()
+    d = _parse_yyyy_mm_date(dt)
+    if d is None:
+        raise bberr.InvalidYearMonthDate(dt, source)
+    return d
+
+# Cached without the source position, None if the format is not recognized
+@lru_cache(maxsize=4096)
+def _parse_yyyy_mm_date(dt: str) -> date | None:
     # Thanks to excel, yyyy-mm date can be 
     # YYYY-MM-DD, 
     # mmm-YY 
     # YY-mmm or 
     # YYYY-MM
-    dt = s.strip()
     dt_array = dt.split("-")
     if len(dt_array) == 3:
         # YYYY-MM-DD
-        dt = date.fromisoformat(dt)
+        dt = _parse_iso_date(dt)
     else:
         len1 = len(dt_array[0])
         len2 = len(dt_array[1])
@@ -90,32 +119,47 @@ def read_yyyy_mm_date(s: str, source: SourcePosition = None) -> date:
         c2 = not d2
         if c1 and d2 and len2 == 2:
             # mmm-YY
-            dt = datetime.strptime(dt, "%b-%y").date()
+            dt = _month_date(dt_array[0], dt_array[1], dt, "%b-%y")
         elif c1 and d2 and len2 == 4:
             # mmm-YYYY
-            dt = datetime.strptime(dt, "%b-%Y").date()
+            dt = _month_date(dt_array[0], dt_array[1], dt, "%b-%Y")
         elif d1 and len1 == 2 and c2:
             # YY-mmm
-            dt = datetime.strptime(dt, "%y-%b").date()
+            dt = _month_date(dt_array[1], dt_array[0], dt, "%y-%b")
         elif d1 and len1 == 4 and c2:
             # YYYY-mmm
-            dt = datetime.strptime(dt, "%Y-%b").date()
+            dt = _month_date(dt_array[1], dt_array[0], dt, "%Y-%b")
         elif d1 and len1 == 4 and d2 and len2 == 2:
-            # YYYY-MM
-            dt = datetime.strptime(dt, "%Y-%m").date()
+            # YYYY-MM, no need for strptime
+            dt = date(int(dt_array[0]), int(dt_array[1]), 1)
         else:
-            raise bberr.InvalidYearMonthDate(dt, source)
+            return None
 
     return dt
 
+_month_numbers = dict([(m, i) for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun",
+                                                   "jul", "aug", "sep", "oct", "nov", "dec"], start=1)])
+
+def _month_date(month: str, year: str, s: str, format: str) -> date:
+    """First day of the month for an abbreviated month name and a 2 or 4 digits year.
+
+    Other month names are left to strptime with the given format."""
+    m = _month_numbers.get(month.lower())
+    if m is None or not year.isdecimal():
+        return datetime.strptime(s, format).date()
+    y = int(year)
+    if len(year) == 2:
+        # Same pivot as strptime %y
+        y += 2000 if y < 69 else 1900
+    return date(y, m, 1)
+
 def write_csv(data: list[list[str]], csvFile: CsvFile) -> None:
     """Write accounts to file."""
     csv_conf = csvFile.config
-    with open(csvFile.path, 'w', encoding=csv_conf.encoding) as xlfile:
+    with open(csvFile.path, 'w', encoding=csv_conf.encoding, newline='', buffering=_buffer_size) as xlfile:
         writer = csv.writer(xlfile, delimiter=csv_conf.column_separator,
                           quotechar=csv_conf.quotechar, quoting=csv.QUOTE_MINIMAL)
-        for row in data:
-            writer.writerow(row)
+        writer.writerows(data)
 
 class CsvColumn:
     def __init__(self, name: str, type: str, required: bool, required_value: bool,
@@ -138,60 +182,84 @@ def load_csv(csv_file: CsvFile, header: list[CsvColumn],
 
     A field source is added to each row object.
     """
-    # if file does not exist, return an empty list
-    if not os.path.exists(csv_file.path):
+    names = [h.name for h in header]
+    return [(dict(zip(names, values)), source) for values, source in iter_csv(csv_file, header, warn_extra_columns)]
+
+def iter_csv(csv_file: CsvFile, header: list[CsvColumn],
+             warn_extra_columns: bool = False) -> Iterator[tuple[list[any], SourcePosition]]:
+    """Same as load_csv, but yield the rows one at a time while the file is read.
+
+    Each row is a list of values in the order of the header, so it can be unpacked directly.
+    Errors are raised when the faulty row is reached."""
+    csv_conf = csv_file.config
+    try:
+        f = open(csv_file.path, encoding=csv_conf.encoding, newline='', buffering=_buffer_size)
+    except FileNotFoundError:
+        # if file does not exist, there is nothing to yield
         # Select basename to avoid displaying the full path
         basename = os.path.basename(csv_file.path)
         logger.warning(f"Cannot open csv file.\nFile '{basename}' does not exist.\nFullpath: {csv_file.path}")
-        return []
-    
-    csv_conf = csv_file.config
+        return
+
     line = 1
-    with open(csv_file.path, encoding=csv_conf.encoding) as f:
+    with f:
         for _ in range(csv_conf.skip_X_lines):
-            next(f)
+            # A file shorter than the skipped lines has no header, the check of
+            # the required columns below reports it
+            if next(f, None) is None:
+                break
             line += 1
 
-        rows = csv.DictReader(f, delimiter=csv_conf.column_separator,
-                              quotechar=csv_conf.quotechar)
-        
-        # Check that the required columns are present
-        for h in header:
-            if h.required and h.name not in rows.fieldnames:
-                raise bberr.MissingRequiredColumn(h.name, SourcePosition(csv_file.path, line, None))
+        rows = csv.reader(f, delimiter=csv_conf.column_separator,
+                          quotechar=csv_conf.quotechar)
+        fieldnames = next(rows, [])
+
+        # Position of each column in the file, the columns missing from the file
+        # always take their default value.
+        # Like csv.DictReader, the last column wins if a name is duplicated.
+        indices = dict([(name, i) for i, name in enumerate(fieldnames)])
+
+        # Check that the required columns are present, all missing columns are reported at once
+        missing = [h.name for h in header if h.required and h.name not in indices]
+        if missing:
+            raise bberr.MissingRequiredColumn(missing, SourcePosition(csv_file.path, line, None))
 
         # Warn if some columns are not in the header
         if warn_extra_columns:
-            hnames = [h.name for h in header]
-            for f in rows.fieldnames:
-                if f not in hnames:
-                    logger.warning(f"Unknown column '{f}' in the header of '{csv_file.path}'.")
+            hnames = set([h.name for h in header])
+            for name in fieldnames:
+                if name not in hnames:
+                    logger.warning(f"Unknown column '{name}' in the header of '{csv_file.path}'.")
 
-        # Build the list of present columns
-        present_columns = [True if h.name in rows.fieldnames else False for h in header]
+        # The parser of each column is chosen once, not for every value
+        header_source = SourcePosition(csv_file.path, line, None)
+        present_columns = [(pos, indices[h.name], _value_parser(h.type, csv_conf, header_source),
+                            h.required_value, h.name) 
+                           for pos, h in enumerate(header) if h.name in indices]
+        default_values = [h.default_value for h in header]
 
+        # Local names for the row loop
+        path = csv_file.path
+        width = len(fieldnames)
         line += 1 # header line
-        ls = []
         for r in rows:
-            rowdata = dict()
-            source = SourcePosition(csv_file.path, line, None)
-            for i, h in enumerate(header):
-                if not present_columns[i]:
-                    rowdata[h.name] = h.default_value
-                    continue
-
-                value = r[h.name].strip() if r[h.name] else None
+            if not r:
+                # Skip empty lines like csv.DictReader
+                continue
+            if len(r) < width:
+                # Short rows are padded once, the missing cells are empty
+                r.extend([""] * (width - len(r)))
+            values = default_values.copy()
+            source = SourcePosition(path, line, None)
+            for pos, idx, parser, required_value, name in present_columns:
+                value = r[idx].strip()
                 if not value:
-                    if h.required_value:
-                        raise bberr.RequiredValueEmpty(h.name, source)
-                    else:
-                        rowdata[h.name] = h.default_value
-                        continue
+                    if required_value:
+                        raise bberr.RequiredValueEmpty(name, source)
+                    # Keep the default value
+                    continue
 
-                value = read_value(value, h.type, csv_conf, source)
-                rowdata[h.name] = value
+                values[pos] = parser(value, source) if parser else value
 
-            ls.append((rowdata, source))
-            line += 1
-            
-        return ls
\ No newline at end of file
+            yield (values, source)
+            line += 1
\ No newline at end of file
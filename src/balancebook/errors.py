@@ -1,15 +1,27 @@
+import copyreg
 import logging
 import os
 from datetime import date
+from functools import wraps
 
 logger = logging.getLogger(__name__)
 
 class SourcePosition:
     """Class to store the source position of an error"""
+    __slots__ = ("file", "line", "column", "_basename")
+
     def __init__(self,file: str, line: int = None, column: int = None):
         self.file = file
         self.line = line
         self.column = column
+        self._basename = None
+
+    @property
+    def basename(self) -> str:
+        """Base name of the file, computed on first use"""
+        if self._basename is None:
+            self._basename = os.path.basename(self.file)
+        return self._basename
 
     def __str__(self):
         if self.line is None:
@@ -19,272 +31,395 @@ class SourcePosition:
         return f"{self.file}:{self.line}:{self.column}"
 
 def add_source_position(source: SourcePosition):
+    """Decorator setting the source position of the errors raised without one"""
     def decorator(function):
+        @wraps(function)
         def wrapper(*args, **kwargs):
             try:
                 return function(*args, **kwargs)
             except BBookException as e:
-                raise BBookException("Source position", source) from e
+                if e.source is None:
+                    e.source = source
+                raise
         return wrapper
     return decorator
 
+class _Attributes:
+    """Mapping over the attributes of an object, properties included"""
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __getitem__(self, key: str):
+        return getattr(self.obj, key)
+
 class BBookException(Exception):
-    """Base exception class for PyBalanceBook."""
-    def __init__(self, message: str, source: SourcePosition = None):
-        self.message = message
+    """Base exception class for PyBalanceBook.
+
+    Subclasses set a template formatted with their attributes and properties.
+    The message is only built when the error is displayed."""
+    template = None
+
+    def __init__(self, message: str = None, source: SourcePosition = None):
+        self._message = message
         self.source = source
-        if self.message:
-            msg = self.message
-        else:
-            msg = ""
-        if source is not None:
-            # Select base name of file
-            basename = os.path.basename(source.file)
-            msg = msg + f"\nFile: {basename} line: {source.line}\n" + f"Fullpath: {source}"
+        super().__init__()
 
-        super().__init__(msg)
+    @property
+    def message(self) -> str:
+        if self._message is None and self.template is not None:
+            self._message = self.template.format_map(_Attributes(self))
+        return self._message
+
+    @message.setter
+    def message(self, message: str) -> None:
+        self._message = message
+
+    @property
+    def args(self) -> tuple:
+        # Like Exception, the message is the only argument
+        return (self.message,)
+
+    @args.setter
+    def args(self, args: tuple) -> None:
+        self._message = args[0] if args else None
+
+    def __reduce__(self):
+        # The arguments are not kept in args, copy and pickle rebuild the error from its attributes
+        return (copyreg.__newobj__, (type(self),), self.__dict__.copy())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.message!r})"
+
+    def __str__(self):
+        msg = self.message if self.message else ""
+        if self.source is not None:
+            # Select base name of file
+            msg = msg + f"\nFile: {self.source.basename} line: {self.source.line}\n" + f"Fullpath: {self.source}"
+        return msg
 
 class JournalNotLoaded(BBookException):
     """Exception raised when the journal is not loaded"""
+    template = "Journal not loaded"
+
     def __init__(self, source: SourcePosition = None):
-        msg = "Journal not loaded"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class JournalUnknownTxn(BBookException):
     """Exception raised when a transaction is unknown"""
+    template = "Unknown transaction: {txn_id}"
+
     def __init__(self, txn_id: int, source: SourcePosition = None):
         self.txn_id = txn_id
-        msg = f"Unknown transaction: {txn_id}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class ReservedAccountId(BBookException):
     """Exception raised when an account id is reserved"""
+    template = "Account identifier: {account_id} is reserved for top-level accounts. To redefined it, leave the parent column empty."
+
     def __init__(self, account_id: str, source: SourcePosition = None):
         self.account_id = account_id
-        msg = f"Account identifier: {account_id} is reserved for top-level accounts. To redefined it, leave the parent column empty."
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class InvalidYamlType(BBookException):
     """Exception raised when the YAML type is invalid"""
+    template = "Invalid YAML type. Expected: {expected_type}. Actual: {actual_type}"
+
     def __init__(self, expected_type: str, actual_type: str, source: SourcePosition = None):
         self.expected_type = expected_type
         self.actual_type = actual_type
-        msg = f"Invalid YAML type. Expected: {expected_type}. Actual: {actual_type}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class ParentAccountNotFound(BBookException):
     """Exception raised when a parent account is not found"""
+    template = "Parent account not found: {parent_account_id}"
+
     def __init__(self, parent_account_id: str, source: SourcePosition = None):
         self.parent_account_id = parent_account_id
-        msg = f"Parent account not found: {parent_account_id}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class InvalidLanguage(BBookException):
     """Exception raised when the language is invalid"""
+    template = "Invalid language: {lang}"
+
     def __init__(self, lang: str, source: SourcePosition = None):
         self.lang = lang
-        msg = f"Invalid language: {lang}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class AccountNumberReserved(BBookException):
     """Exception raised when an account number is reserved"""
+    template = "Account number: {account_number} is reserved for top-level accounts."
+
     def __init__(self, account_number: int, source: SourcePosition = None):
         self.account_number = account_number
-        msg = f"Account number: {account_number} is reserved for top-level accounts."
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class ParentAccountNotSpecified(BBookException):
     """Exception raised when a parent account is not specified"""
+    template = "Parent account not specified for: {account_id}"
+
     def __init__(self, account_id: str, source: SourcePosition = None):
         self.account_id = account_id
-        msg = f"Parent account not specified for: {account_id}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class AccountCycle(BBookException):
     """Exception raised when an account cycle is detected"""
+    template = "Account cycle detected for: {account_id}"
+
     def __init__(self, account_id: str, source: SourcePosition = None):
         self.account_id = account_id
-        msg = f"Account cycle detected for: {account_id}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class JournalUnknownPosting(BBookException):
     """Exception raised when a posting is unknown"""
+    template = "Unknown posting: {posting_id}"
+
     def __init__(self, posting_id: int, source: SourcePosition = None):
         self.posting_id = posting_id
-        msg = f"Unknown posting: {posting_id}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class InvalidDateFormat(BBookException):
     """Exception raised when the date format is invalid"""
+    template = "Invalid date format: {date}. Must be YYYY-MM-DD"
+
     def __init__(self, date: str, source: SourcePosition = None):
         self.date = date
-        msg = f"Invalid date format: {date}. Must be YYYY-MM-DD"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class InvalidYearMonthDate(BBookException):
     """Exception raised when the date format is invalid"""
+    template = "Invalid year and month date format: {date}. Must be YYYY-MM-DD, mmm-YY, mmm-YYYY, YY-mmm, YYYY-mmm or YYYY-MM"
+
     def __init__(self, date: str, source: SourcePosition = None):
         self.date = date
-        msg = f"Invalid year and month date format: {date}. Must be YYYY-MM-DD, mmm-YY, mmm-YYYY, YY-mmm, YYYY-mmm or YYYY-MM"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class InvalidAmount(BBookException):
     """Exception raised when an amount is invalid"""
+    template = "Invalid amount: {amount}"
+
     def __init__(self, amount: str, source: SourcePosition = None):
         self.amount = amount
-        msg = f"Invalid amount: {amount}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class TxnNotSingleDay(BBookException):
     """Exception raised when the transaction is not single-day"""
+    template = "Transaction {txn_id} is not single-day"
+
     def __init__(self, txn_id: int, source: SourcePosition = None):
         self.txn_id = txn_id
-        msg = f"Transaction {txn_id} is not single-day"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class RequiredValueEmpty(BBookException):
     """Exception raised when a required column is empty"""
+    template = "Required column is empty: {column}"
+
     def __init__(self, column: str, source: SourcePosition = None):
         self.column = column
-        msg = f"Required column is empty: {column}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class TxnDateMismatch(BBookException):
     """Exception raised when the transaction date does not match"""
+    template = "Transaction {txn_id} has two different dates: {date1} and {date2}"
+
     def __init__(self, txn_id: int, date1: date, date2: date, source: SourcePosition = None):
         self.txn_id = txn_id
         self.date1 = date1
         self.date2 = date2
-        msg = f"Transaction {txn_id} has two different dates: {date1} and {date2}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class UnknownAccountType(BBookException):
     """Exception raised when an account type is unknown"""
+    template = "Unknown account type: {acc_type}"
+
     def __init__(self, acc_type: str, source: SourcePosition = None):
         self.acc_type = acc_type
-        msg = f"Unknown account type: {acc_type}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class UnknownAccount(BBookException):
     """Exception raised when an account is unknown"""
+    template = "Unknown account: {identifier}"
+
     def __init__(self, identifier: str, source: SourcePosition = None):
         self.identifier = identifier
-        msg = f"Unknown account: {identifier}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class AssetsNumberInvalid(BBookException):
     """Exception raised when the asset account number is invalid"""
+    template = "Invalid account number: {number}. Must be between 1000 and 1999 for asset accounts."
+
     def __init__(self, number: int, source: SourcePosition = None):
         self.number = number
-        msg = f"Invalid account number: {number}. Must be between 1000 and 1999 for asset accounts."
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class LiabilitiesNumberInvalid(BBookException):
     """Exception raised when the liability account number is invalid"""
+    template = "Invalid account number: {number}. Must be between 2000 and 2999 for liability accounts."
+
     def __init__(self, number: int, source: SourcePosition = None):
         self.number = number
-        msg = f"Invalid account number: {number}. Must be between 2000 and 2999 for liability accounts."
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class DuplicateBalance(BBookException):
     """Exception raised when a balance is duplicated"""
+    template = "Duplicate balance: {date} {identifier}"
+
     def __init__(self, date: date, identifier: str, source: SourcePosition = None):
         self.date = date
         self.identifier = identifier
-        msg = f"Duplicate balance: {date} {identifier}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class EquityNumberInvalid(BBookException):
     """Exception raised when the equity account number is invalid"""
+    template = "Invalid account number: {number}. Must be between 3000 and 3999 for equity accounts."
+
     def __init__(self, number: int, source: SourcePosition = None):
         self.number = number
-        msg = f"Invalid account number: ${number}. Must be between 3000 and 3999 for equity accounts."
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class IncomeNumberInvalid(BBookException):
     """Exception raised when the income account number is invalid"""
+    template = "Invalid account number: {number}. Must be between 4000 and 4999 for income accounts."
+
     def __init__(self, number: int, source: SourcePosition = None):
         self.number = number
-        msg = f"Invalid account number: ${number}. Must be between 4000 and 4999 for income accounts."
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class ExpensesNumberInvalid(BBookException):
     """Exception raised when the expense account number is invalid"""
+    template = "Invalid account number: {number}. Must be between 5000 and 5999 for expense accounts."
+
     def __init__(self, number: int, source: SourcePosition = None):
         self.number = number
-        msg = f"Invalid account number: ${number}. Must be between 5000 and 5999 for expense accounts."
-        super().__init__(msg, source)
+        super().__init__(source=source)
+
+# Maximum number of values displayed in a message, the full list stays on the exception
+_preview_size = 20
+
+def _preview(values: list) -> str:
+    more = len(values) - _preview_size
+    if more > 0:
+        return f"{values[:_preview_size]} ...and {more} more"
+    return f"{values}"
 
 class AccountNumberNotUnique(BBookException):
     """Exception raised when the account number is not unique"""
+    template = "The account numbers must be unique. The following account numbers are duplicated: {numbers_preview}"
+
     def __init__(self, numbers: list[int], source: SourcePosition = None):
         self.numbers = numbers
-        msg = f"The account numbers must be unique. The following account numbers are duplicated: {numbers}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
+
+    @property
+    def numbers_preview(self) -> str:
+        return _preview(self.numbers)
 
 class AccountIdentifierNotUnique(BBookException):
     """Exception raised when the account identifier is not unique"""
+    template = "The account identifiers must be unique. The following account identifiers are duplicated: {identifiers_preview}"
+
     def __init__(self, identifiers: list[str], source: SourcePosition = None):
         self.identifiers = identifiers
-        msg = f"The account identifiers must be unique. The following account identifiers are duplicated: {identifiers}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
-class AccountTypeUnknown(BBookException):
-    """Exception raised when the account type is unknown"""
-    def __init__(self, acc_type: str, source: SourcePosition = None):
-        self.acc_type = acc_type
-        msg = f"Unknown account type: {acc_type}"
-        super().__init__(msg, source)
+    @property
+    def identifiers_preview(self) -> str:
+        return _preview(self.identifiers)
+
+# Same error as UnknownAccountType, kept under both names
+AccountTypeUnknown = UnknownAccountType
+
+def _amount_str(n: int) -> str:
+    # Imported here, balancebook.amount imports this module
+    from balancebook.amount import amount_to_str
+    return amount_to_str(n)
 
 class BalanceAssertionFailed(BBookException):
     """Exception raised when the balance assertion failed"""
+    template = "Balance assertion not verified\nAccount: {account}\nDate: {date}\nStatement balance: {statement_balance_str}\nComputed balance: {computed_balance_str}\nDifference: {difference_str}"
+
     def __init__(self, dt: date, identifier: str, statement_balance: int, computed_balance: int, source: SourcePosition = None):
         self.date = dt
         self.account = identifier
-        self.statement_balance = statement_balance / 100
-        self.computed_balance = computed_balance / 100
-        self.difference = round(self.computed_balance - self.statement_balance, 2)
-        msg = f"Balance assertion not verified\nAccount: {self.account}\nDate: {dt}\nStatement balance: {self.statement_balance:.2f}\nComputed balance: {self.computed_balance:.2f}\nDifference: {self.difference:.2f}"
-        super().__init__(msg, source)
+        # Integer amounts like everywhere else, converted only for display
+        self.statement_amount = statement_balance
+        self.computed_amount = computed_balance
+        super().__init__(source=source)
+
+    @property
+    def statement_balance(self) -> float:
+        return self.statement_amount / 100
+
+    @property
+    def computed_balance(self) -> float:
+        return self.computed_amount / 100
+
+    @property
+    def difference(self) -> float:
+        return (self.computed_amount - self.statement_amount) / 100
+
+    @property
+    def statement_balance_str(self) -> str:
+        return _amount_str(self.statement_amount)
+
+    @property
+    def computed_balance_str(self) -> str:
+        return _amount_str(self.computed_amount)
+
+    @property
+    def difference_str(self) -> str:
+        return _amount_str(self.computed_amount - self.statement_amount)
 
 class InvalidCsvType(BBookException):
     """Exception raised when the CSV type is invalid"""
+    template = "Invalid CSV column type: {type}"
+
     def __init__(self, type: str, source: SourcePosition = None):
         self.type = type
-        msg = f"Invalid CSV column type: {type}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class InvalidInt(BBookException):
     """Exception raised when an integer is invalid"""
+    template = "Invalid integer: {s}"
+
     def __init__(self, s: str, source: SourcePosition = None):
         self.s = s
-        msg = f"Invalid integer: {s}"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class TxnLessThanTwoPostings(BBookException):
     """Exception raised when the transaction has less than two postings"""
+    template = "Transaction {txn_id} has less than two postings"
+
     def __init__(self, txn_id: int, source: SourcePosition = None):
         self.txn_id = txn_id
-        msg = f"Transaction {txn_id} has less than two postings"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class TxnNotBalanced(BBookException):
     """Exception raised when the transaction is not balanced"""
+    template = "Transaction {txn_id} is not balanced"
+
     def __init__(self, txn_id: int, source: SourcePosition = None):
         self.txn_id = txn_id
-        msg = f"Transaction {txn_id} is not balanced"
-        super().__init__(msg, source)
+        super().__init__(source=source)
 
 class MissingRequiredColumn(BBookException):
-    """Exception raised when a header is missing"""
-    def __init__(self, header: str, source: SourcePosition = None):
-        self.header = header
-        msg = f"Missing header: {header}"
-        super().__init__(msg, source)
+    """Exception raised when one or more headers are missing"""
+    template = "Missing header: {headers_str}"
+
+    def __init__(self, header: str | list[str], source: SourcePosition = None):
+        self.headers = header if isinstance(header, list) else [header]
+        self.header = self.headers[0]
+        super().__init__(source=source)
+
+    @property
+    def headers_str(self) -> str:
+        return ", ".join(self.headers)
 
 class MissingRequiredKey(BBookException):
     """Exception raised when a key is missing"""
+    template = "Missing key: {dedup_key}"
+
     def __init__(self, key: str, source: SourcePosition = None):
         self.dedup_key = key
-        msg = f"Missing key: {key}"
-        super().__init__(msg, source)
\ No newline at end of file
+        super().__init__(source=source)
\ No newline at end of file
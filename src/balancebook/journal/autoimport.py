@@ -4,7 +4,7 @@ import os
 from yaml import safe_load
 
 from datetime import date
-from balancebook.csv import CsvFile, load_csv, write_csv,SourcePosition, CsvConfig, CsvColumn
+from balancebook.csv import CsvFile, iter_csv, write_csv,SourcePosition, CsvConfig, CsvColumn
 import balancebook.errors as bberr
 from balancebook.errors import add_source_position
 from balancebook.amount import amount_to_str
@@ -217,7 +217,7 @@ def load_classification_rules(csvFile: CsvFile,
     comment_i18n = i18n["Comment"]
     payee_i18n = i18n["Payee"]
 
-    csv_rows = load_csv(csvFile, [CsvColumn(date_from_i18n, "date", True, False), 
+    csv_rows = iter_csv(csvFile, [CsvColumn(date_from_i18n, "date", True, False), 
                                   CsvColumn(date_to_i18n, "date", True, False), 
                                   CsvColumn(amnt_from_i18n, "amount", True, False), 
                                   CsvColumn(amnt_to_i18n, "amount", True, False), 
@@ -229,20 +229,16 @@ def load_classification_rules(csvFile: CsvFile,
                                   CsvColumn(st_payee_i18n, "str", True, False)],
                                   warn_extra_columns=True)
     rules = []
-    for row, source in csv_rows:
-        if row[acc2_i18n] is None:
+    for (date_from, date_to, amnt_from, amnt_to, acc_re, desc_re, acc2_id, 
+         comment, payee, st_payee), source in csv_rows:
+        if acc2_id is None:
             acc2 = None
-        elif row[acc2_i18n] not in accounts_by_number:
-            raise bberr.UnknownAccount(row[acc2_i18n], source)
         else:
-            acc2 = accounts_by_number[row[acc2_i18n]]
-        mdate = (row[date_from_i18n], row[date_to_i18n])
-        mamnt = (row[amnt_from_i18n], row[amnt_to_i18n])
-        acc_re = row[account_i18n]
-        desc_re = row[st_desc_i18n]
-        comment = row[comment_i18n]
-        payee = row[payee_i18n]
-        st_payee = row[st_payee_i18n]
+            acc2 = accounts_by_number.get(acc2_id)
+            if acc2 is None:
+                raise bberr.UnknownAccount(acc2_id, source)
+        mdate = (date_from, date_to)
+        mamnt = (amnt_from, amnt_to)
         r = ClassificationRule(mdate, mamnt, acc_re, desc_re, st_payee, acc2, payee, comment, source)
         if filter_drop_all and r.is_drop_all_rule():
             logger.info(f"Skipping drop all rule at {r.source}")
@@ -285,46 +281,52 @@ def import_bank_postings(csvFile : CsvFile, csv_header: CsvImportHeader, account
                   CsvColumn(csv_header.amount_type.inflow_column(), "amount", True, False, default_value=0),
                   CsvColumn(csv_header.amount_type.outflow_column(), "amount", True, False, default_value=0)]
 
+    # Position of the optional columns in the rows yielded by iter_csv
+    st_date_pos = None
     if csv_header.statement_date:
+        st_date_pos = len(header)
         header.append(CsvColumn(csv_header.statement_date, "date", True, False))
 
+    st_desc_pos = len(header)
     if csv_header.statement_description:
         for x in csv_header.statement_description:
             header.append(CsvColumn(x, "str", True, False))
 
+    payee_pos = len(header)
     if csv_header.payee:
         for x in csv_header.payee:
             header.append(CsvColumn(x, "str", False, False))
 
-    csv_rows = load_csv(csvFile, header, warn_extra_columns=False)
+    single_amount = csv_header.amount_type.is_single_amount_column()
+    csv_rows = iter_csv(csvFile, header, warn_extra_columns=False)
     ls = []
     for row, source in csv_rows:
-        dt = row[csv_header.date]
-        if csv_header.amount_type.is_single_amount_column():
-            amount = row[csv_header.amount_type.amount_column()]
+        dt = row[0]
+        if single_amount:
+            amount = row[1]
         else:
-            inflow = row[csv_header.amount_type.inflow_column()]
-            outflow = row[csv_header.amount_type.outflow_column()]
+            inflow = row[1]
+            outflow = row[2]
             amount = inflow - outflow
 
         if not import_zero_amount and amount == 0:
             continue
 
-        if csv_header.statement_date and row[csv_header.statement_date]:
-            st_date = row[csv_header.statement_date]
+        if st_date_pos is not None and row[st_date_pos]:
+            st_date = row[st_date_pos]
         else:
             st_date = dt
 
         if csv_header.statement_description:
             # Join all the statement description columns
-            ds = [row[x] for x in csv_header.statement_description if row[x] is not None]
+            ds = [x for x in row[st_desc_pos:payee_pos] if x is not None]
             st_desc = csv_header.join_sep.join(ds)
         else:
             st_desc = None
 
         if csv_header.payee:
             # Join all the payee columns
-            ds = [row[x] for x in csv_header.payee if row[x] is not None]
+            ds = [x for x in row[payee_pos:] if x is not None]
             payee = csv_header.join_sep.join(ds)
         else:
             payee = None
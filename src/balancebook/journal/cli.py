@@ -2,6 +2,7 @@ import argparse
 import logging
 import os
 import datetime
+from functools import wraps
 from balancebook.__about__ import __version__
 from balancebook.errors import BBookException
 from balancebook.journal.config import load_config
@@ -57,15 +58,16 @@ autostatement_parser = subparsers.add_parser('autostatement',
 
 def catch_and_log(func):
     """Decorator to catch and log exceptions"""
+    @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
         except BBookException as e:
-            logger.fatal(e)
+            logger.fatal("%s", e)
             logger.debug("Exception info", exc_info=True)
             return 3
         except Exception as e:
-            logger.fatal(e)
+            logger.fatal("%s", e)
             logger.debug("Exception info", exc_info=True)
             return 1
     
@@ -1,11 +1,12 @@
 import os
 import logging
-import csv
 import shutil
 from bisect import bisect_right
 from itertools import groupby
+from operator import attrgetter, itemgetter
 from datetime import date, datetime, timedelta
 from collections import defaultdict
+from functools import wraps
 
 import balancebook.errors as bberr
 from balancebook.amount import amount_to_str
@@ -19,6 +20,7 @@ from balancebook.journal.config import JournalConfig
 logger = logging.getLogger(__name__)
 
 def assert_loaded(func):
+    @wraps(func)
     def wrapper(*args, **kwargs):
         if args[0].chart_of_accounts is None:
             raise bberr.JournalNotLoaded()
@@ -69,31 +71,31 @@ class Journal():
         self._txns_by_id = dict([(t.id, t) for t in self.txns])
         
         ps = [p for t in self.txns for p in t.postings]
-        ps.sort(key=lambda x: (x.account.number, x.date))
+        ps.sort(key=attrgetter("account.number", "date"))
         self._postings_by_account = {}
-        for n, ps in groupby(ps, key=lambda x: x.account.number):
+        for n, ps in groupby(ps, key=attrgetter("account.number")):
             self._postings_by_account[n] = list(ps)
                 
         self._account_balance = {}
         for acc, value in self._postings_by_account.items():
             self._account_balance[acc] = []
             total = 0
-            for dt, ps in groupby(value, key=lambda x: x.date):
+            for dt, ps in groupby(value, key=attrgetter("date")):
                 total += sum([p.amount for p in ps])
                 self._account_balance[acc].append((dt, total))
 
         self._account_st_balance = {}
         for acc, value in self._postings_by_account.items():
             self._account_st_balance[acc] = []
-            value2 = sorted(value, key=lambda x: x.statement_date)
+            value2 = sorted(value, key=attrgetter("statement_date"))
             total = 0
-            for dt, ps in groupby(value2, key=lambda x: x.statement_date):
+            for dt, ps in groupby(value2, key=attrgetter("statement_date")):
                 total += sum([p.amount for p in ps])
                 self._account_st_balance[acc].append((dt, total))
 
-        assertions = sorted(self.balance_assertions, key=lambda x: (x.account.number, x.date))
+        assertions = sorted(self.balance_assertions, key=attrgetter("account.number", "date"))
         self._assertion_by_account = {}
-        for n, assertion in groupby(assertions, key=lambda x: x.account.number):
+        for n, assertion in groupby(assertions, key=attrgetter("account.number")):
             self._assertion_by_account[n] = list(assertion)
     
     def load(self) -> None:
@@ -108,11 +110,13 @@ class Journal():
             self.balance_assertions = load_balances(self.config.data.balance_file, self._accounts_by_name, self.config.i18n)
         self._init_txns_cache()
 
+        # All the accounts below come from the config file and share its source position
+        source = SourcePosition(self.config.config_path, 0, 0)
+
         # Convert auto balance accounts to Account
         if self.config.auto_balance is not None:
             accounts2 = {}
             for acc, acc2 in self.config.auto_balance.accounts.items():
-                source = SourcePosition(self.config.config_path, 0, 0)
                 try:
                     new_acc = self._accounts_by_name[acc]
                 except KeyError:
@@ -128,7 +132,6 @@ class Journal():
         if self.config.auto_statement_date is not None:
             accounts2 = []
             for acc in self.config.auto_statement_date.accounts:
-                source = SourcePosition(self.config.config_path, 0, 0)
                 try:
                     new_acc = self._accounts_by_name[acc]
                 except KeyError:
@@ -138,7 +141,6 @@ class Journal():
 
         # Convert account groups to accounts
         for name, (t, f, accs) in self.config.export.account_groups.items():
-            source = SourcePosition(self.config.config_path, 0, 0)
             new_accs = []
             for acc in accs:
                 try:
@@ -156,9 +158,9 @@ class Journal():
         for t in self.chart_of_accounts:
             t.sort_children()
         for t in self.txns:
-            t.postings.sort(key=lambda x: (x.date,x.account.number))
+            t.postings.sort(key=attrgetter("date", "account.number"))
         self.txns.sort(key=lambda x: (x.postings[0].date,x.postings[0].account.number, x.id))
-        self.balance_assertions.sort(key=lambda x: (x.date, x.account.number))
+        self.balance_assertions.sort(key=attrgetter("date", "account.number"))
 
     @assert_loaded
     def accounts(self) -> list[Account]:
@@ -233,7 +235,7 @@ class Journal():
         
         txns = [t.copy() for t in self.txns]
         for t in txns:
-            t.postings.sort(key=lambda x: (x.date,x.account.number))
+            t.postings.sort(key=attrgetter("date", "account.number"))
         txns.sort(key=lambda x: (x.postings[0].date,x.postings[0].account.number, x.id))
 
         i18n = self.config.i18n
@@ -267,12 +269,18 @@ class Journal():
         # Other
         header.extend([i18n [x] for x in ["Other accounts"]])
 
+        # Looked up once instead of for each posting
+        account_groups = list(self.config.export.account_groups.items())
+        decimal_separator = conf.decimal_separator
+        true_i18n = i18n["True"]
+        false_i18n = i18n["False"]
+
         ls: list[list[str]] = [header]
         for t in txns:
             
             txn_groups: dict[str,bool] = defaultdict(bool)
             for p in t.postings:
-                for n, (_, _, accs) in self.config.export.account_groups.items():
+                for n, (_, _, accs) in account_groups:
                     if txn_groups[n] == True:
                         continue
                     if p.account in accs:
@@ -280,7 +288,7 @@ class Journal():
 
             for i, p in enumerate(t.postings, start=1):
                 # Transactions columns
-                row = [t.id, p.date, p.account.identifier, amount_to_str(p.amount, conf.decimal_separator), p.payee,
+                row = [t.id, p.date, p.account.identifier, amount_to_str(p.amount, decimal_separator), p.payee,
                          p.statement_date, p.statement_description, p.comment]
                 row.append(i)
 
@@ -295,16 +303,16 @@ class Journal():
                         row.append("")
 
                 # Group related columns
-                for n, (true_label, false_label, accs) in self.config.export.account_groups.items():
+                for n, (true_label, false_label, accs) in account_groups:
                     row.append(true_label if p.account in accs else false_label)
                     row.append(true_label if txn_groups[n] else false_label)
 
                 # Datetime related columns
                 rel_month = (p.date.year - today.year) * 12 + (p.date.month - today.month)
                 year_month = f"{p.date.year}-{p.date.month:02d}"
-                last91 = i18n["True"] if p.last91(today) else i18n["False"]
-                last182 = i18n["True"] if p.last182(today) else i18n["False"]
-                last365 = i18n["True"] if p.last365(today) else i18n["False"]
+                last91 = true_i18n if p.last91(today) else false_i18n
+                last182 = true_i18n if p.last182(today) else false_i18n
+                last365 = true_i18n if p.last365(today) else false_i18n
                 row.extend([p.date.year, p.date.month, year_month, p.date.year - today.year, rel_month,
                         self.fiscal_year(p.date), self.fiscal_month(p.date),
                         last91, last182, last365])
@@ -388,7 +396,7 @@ class Journal():
         for a in accs:
             if a.number not in d:
                 continue
-            idx = bisect_right(d[a.number], dt, key=lambda x: x[0])
+            idx = bisect_right(d[a.number], dt, key=itemgetter(0))
             if idx:
                 total += d[a.number][idx-1][1]
 
@@ -397,7 +405,7 @@ class Journal():
     @assert_loaded
     def verify_balances(self) -> None:
         """ Verify that the balances are consistent with the transactions"""
-        bals = sorted(self.balance_assertions, key=lambda x: (x.date, x.account.number))
+        bals = sorted(self.balance_assertions, key=attrgetter("date", "account.number"))
         for b in bals:
             txnAmount = self.account_balance(b.account, b.date, use_statement_date=True, include_subaccounts=True)
 
@@ -462,7 +470,7 @@ class Journal():
 
         # Write new transactions to file
         for t in txns:
-            t.postings.sort(key=lambda x: (x.date, x.account.number))
+            t.postings.sort(key=attrgetter("date", "account.number"))
         txns.sort(key=lambda x: (x.postings[0].date, x.postings[0].account.number))
 
         next_id = max([t.id for t in self.txns]) + 1
@@ -473,26 +481,24 @@ class Journal():
         
         # Write unmatched statement description to file
         ls: list[list[Posting]] = list(unmatched.values())
-        ls.sort(key=lambda x: len(x), reverse=True)
+        ls.sort(key=len, reverse=True)
 
         conf = self.config.import_.unmatched_payee_file.config
-        with open(self.config.import_.unmatched_payee_file.path, "w", encoding=conf.encoding) as f:
-            writer = csv.writer(f, delimiter=conf.column_separator,
-                            quotechar=conf.quotechar, quoting=csv.QUOTE_MINIMAL)
-            writer.writerow([self.config.i18n["Payee"], 
-                             self.config.i18n["Count"],
-                             self.config.i18n["Amount"],
-                             self.config.i18n["Accounts"],
-                             self.config.i18n["Min date"],
-                             self.config.i18n["Max date"]])     
-            for ps in ls:
-                desc = ps[0].payee
-                count = len(ps)
-                amount = amount_to_str(sum([p.amount for p in ps]), conf.decimal_separator)
-                accounts = conf.join_separator.join(set([p.account.name for p in ps]))
-                mindate = min([p.date for p in ps])
-                maxdate = max([p.date for p in ps])
-                writer.writerow([desc, count, amount, accounts, mindate, maxdate])
+        rows = [[self.config.i18n["Payee"], 
+                 self.config.i18n["Count"],
+                 self.config.i18n["Amount"],
+                 self.config.i18n["Accounts"],
+                 self.config.i18n["Min date"],
+                 self.config.i18n["Max date"]]]
+        for ps in ls:
+            desc = ps[0].payee
+            count = len(ps)
+            amount = amount_to_str(sum([p.amount for p in ps]), conf.decimal_separator)
+            accounts = conf.join_separator.join(set([p.account.name for p in ps]))
+            mindate = min([p.date for p in ps])
+            maxdate = max([p.date for p in ps])
+            rows.append([desc, count, amount, accounts, mindate, maxdate])
+        write_csv(rows, self.config.import_.unmatched_payee_file)
 
         return txns
 
@@ -545,7 +551,7 @@ class Journal():
                            x.statement_date <= Balance.date and
                            x.date >= Balance.date - timedelta(days=dayslimit))
         ps = list(filter(check, ps))
-        ps.sort(reverse=True,key=lambda x:x.date)
+        ps.sort(reverse=True,key=attrgetter("date"))
 
         update_pos = subset_sum(ps, txnAmount - Balance.statement_balance)
 
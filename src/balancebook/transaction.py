@@ -1,10 +1,11 @@
 import logging
 from itertools import groupby
+from operator import attrgetter
 from datetime import date, timedelta
 from balancebook.account import Account
 from balancebook.amount import amount_to_str
 from balancebook.i18n import I18n
-from balancebook.csv import CsvFile, load_csv, write_csv, CsvColumn
+from balancebook.csv import CsvFile, iter_csv, write_csv, CsvColumn
 import balancebook.errors as bberr
 from balancebook.errors import SourcePosition
 
@@ -12,6 +13,9 @@ logger = logging.getLogger(__name__)
 
 class Posting():
     """A posting is a variation of an account balance"""
+    __slots__ = ("date", "account", "amount", "payee", "statement_date",
+                 "statement_description", "comment", "source")
+
     def __init__(self, date: date, account: Account, amount: int, payee: str = None,
                  statement_date: date = None, statement_description: str = None,
                  comment: str = None, source: SourcePosition = None):
@@ -61,6 +65,8 @@ class Txn():
     
     Single-day transactions have only one distinct date.
     Multi-day transactions have multiple dates, but the sum of the postings for each date is 0."""
+    __slots__ = ("id", "postings")
+
     def __init__(self,txn_id: int, postings: list[Posting]):
         self.id = txn_id
         self.postings = postings
@@ -87,8 +93,8 @@ class Txn():
 
     def is_daily_balanced(self) -> bool:
         """Return True if the transaction is balanced every day"""
-        ls = sorted(self.postings, key=lambda x: x.date)
-        for _, ps in groupby(ls, key=lambda x: x.date):
+        ls = sorted(self.postings, key=attrgetter("date"))
+        for _, ps in groupby(ls, key=attrgetter("date")):
             ps = list(ps)
             if sum([p.amount for p in ps]) != 0:
                 return False
@@ -99,8 +105,8 @@ class Txn():
         if len(self.postings) != len(other.postings):
             return False
         
-        other_ps = sorted(other.postings, key=lambda x: (x.date, x.account, x.amount))
-        self_ps = sorted(self.postings, key=lambda x: (x.date, x.account, x.amount))
+        other_ps = sorted(other.postings, key=attrgetter("date", "account", "amount"))
+        self_ps = sorted(self.postings, key=attrgetter("date", "account", "amount"))
         for s, o in zip(self_ps, other_ps):
             if not s.equivalent_to(o):
                 return False
@@ -130,7 +136,7 @@ def load_txns(csvFile: CsvFile, accounts_by_name: dict[str,Account],
     comment_i18n = i18n["Comment"]
     payee_i18n = i18n["Payee"]
 
-    csv_rows = load_csv(csvFile, [CsvColumn(txn_id_i18n, "int", True, True), 
+    csv_rows = iter_csv(csvFile, [CsvColumn(txn_id_i18n, "int", True, True), 
                                   CsvColumn(date_i18n, "date", True, True), 
                                   CsvColumn(account_i18n, "str", True, True), 
                                   CsvColumn(amount_i18n, "amount", True, True), 
@@ -140,21 +146,19 @@ def load_txns(csvFile: CsvFile, accounts_by_name: dict[str,Account],
                                   CsvColumn(payee_i18n, "str", False, False)],
                                   warn_extra_columns=True)
     txns_dict: dict[int, Txn] = {}
-    for row, source in csv_rows:
-        txn_id = row[txn_id_i18n]
-        payee = row[payee_i18n]
-        dt = row[date_i18n]
-        st_dt = row[statement_date_i18n] if row[statement_date_i18n] else dt
-        if row[account_i18n] not in accounts_by_name:
-            raise bberr.UnknownAccount(row[account_i18n], source)
-        p = Posting(dt, accounts_by_name[row[account_i18n]], 
-                    row[amount_i18n], payee, st_dt, row[statement_description_i18n], 
-                    row[comment_i18n], source)
-        if txn_id not in txns_dict:
-            t = Txn(txn_id, [p])
-            txns_dict[txn_id] = t
+    for (txn_id, dt, account, amount, st_dt, st_desc, comment, payee), source in csv_rows:
+        if not st_dt:
+            st_dt = dt
+        acc = accounts_by_name.get(account)
+        if acc is None:
+            raise bberr.UnknownAccount(account, source)
+        p = Posting(dt, acc, 
+                    amount, payee, st_dt, st_desc, 
+                    comment, source)
+        t = txns_dict.get(txn_id)
+        if t is None:
+            txns_dict[txn_id] = Txn(txn_id, [p])
         else:
-            t = txns_dict[txn_id]
             t.postings.append(p)
 
     txns = list(txns_dict.values())
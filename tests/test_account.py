@@ -32,6 +32,10 @@ class TestAccount(unittest.TestCase):
                     with self.assertRaises(bberr.BBookException):
                         build_chart_of_accounts([Account("a", "a", 1000*i, str(x))])
 
+        # Test that a redefined top account reports the error of its own type
+        with self.assertRaises(bberr.LiabilitiesNumberInvalid):
+            build_chart_of_accounts([Account(str(AccountType.LIABILITIES), "l", 1000, None)])
+
         # Test that the number corresponding to the account type is accepted
         try:
             build_chart_of_accounts([Account("a", "a", 1001, str(AccountType.ASSETS))])
@@ -53,6 +57,24 @@ class TestAccount(unittest.TestCase):
             verify_accounts([Account("a1", "a1", 1001, str(AccountType.ASSETS)),
                              Account("a2", "a2", 1001, str(AccountType.ASSETS))])
 
+        # Test that all the duplicates are reported and the list is not reordered
+        accounts = [Account("a3", "a3", 1003, str(AccountType.ASSETS)),
+                    Account("a1", "a1", 1001, str(AccountType.ASSETS)),
+                    Account("a4", "a4", 1003, str(AccountType.ASSETS)),
+                    Account("a2", "a2", 1001, str(AccountType.ASSETS)),
+                    Account("a5", "a5", 1001, str(AccountType.ASSETS))]
+        with self.assertRaises(bberr.AccountNumberNotUnique) as cm:
+            verify_accounts(accounts)
+        self.assertEqual(cm.exception.numbers, [1003, 1001])
+        self.assertEqual([a.identifier for a in accounts], ["a3", "a1", "a4", "a2", "a5"])
+
+    def test_account_cycle(self):
+        # Test that a cycle is detected, even when another account hangs below it
+        with self.assertRaises(bberr.AccountCycle) as cm:
+            build_chart_of_accounts([Account("a", "a", 1001, "c"),
+                                     Account("b", "b", 1002, "c"),
+                                     Account("c", "c", 1003, "b")])
+        self.assertEqual(cm.exception.account_id, "b")
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
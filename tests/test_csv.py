@@ -1,6 +1,7 @@
 import unittest
+from datetime import date
 
-from balancebook.csv import CsvFile, CsvConfig, load_csv, CsvColumn
+from balancebook.csv import CsvFile, CsvConfig, load_csv, CsvColumn, read_yyyy_mm_date
 import balancebook.errors as bberr
 
 class TestAccount(unittest.TestCase):
@@ -24,6 +25,26 @@ class TestAccount(unittest.TestCase):
         with self.assertRaises(bberr.MissingRequiredColumn):
             load_csv(csv_file, [CsvColumn("Toto", "int", True, True)]) 
 
+        with self.assertRaises(bberr.MissingRequiredColumn) as cm:
+            load_csv(csv_file, [CsvColumn("Toto", "int", True, True),
+                                CsvColumn("Id", "int", True, True),
+                                CsvColumn("Titi", "int", True, True)])
+        self.assertEqual(cm.exception.headers, ["Toto", "Titi"])
+
+        # Skipping more lines than the file has leaves no header
+        short_file = CsvFile("tests/csv/wrongint.csv", CsvConfig(column_separator=";", encoding="utf-8-sig",
+                                                                 skip_X_lines=10))
+        with self.assertRaises(bberr.MissingRequiredColumn):
+            load_csv(short_file, [CsvColumn("Id", "int", True, True)])
+
         csv_file = CsvFile("tests/csv/wrongrequired.csv", self.config)
         with self.assertRaises(bberr.RequiredValueEmpty):
-            load_csv(csv_file, [CsvColumn("Amount", "int", True, True)]) 
\ No newline at end of file
+            load_csv(csv_file, [CsvColumn("Amount", "int", True, True)]) 
+
+    def test_read_yyyy_mm_date(self):
+        self.assertEqual(read_yyyy_mm_date("2023-04"), date(2023, 4, 1))
+        self.assertEqual(read_yyyy_mm_date("2023-04-15"), date(2023, 4, 15))
+        self.assertEqual(read_yyyy_mm_date("Apr-23"), date(2023, 4, 1))
+        self.assertEqual(read_yyyy_mm_date("apr-1999"), date(1999, 4, 1))
+        self.assertEqual(read_yyyy_mm_date("99-Dec"), date(1999, 12, 1))
+        self.assertEqual(read_yyyy_mm_date("2023-DEC"), date(2023, 12, 1))
@@ -0,0 +1,62 @@
+import copy
+import pickle
+import unittest
+
+import balancebook.errors as bberr
+from balancebook.errors import SourcePosition, add_source_position
+
+class TestErrors(unittest.TestCase):
+    def test_add_source_position(self):
+        source = SourcePosition("config.yaml", 0, 0)
+
+        def unknown_account():
+            raise bberr.UnknownAccount("a")
+
+        # The original error is kept and gets the source position
+        with self.assertRaises(bberr.UnknownAccount) as cm:
+            add_source_position(source)(unknown_account)()
+        self.assertIs(cm.exception.source, source)
+        self.assertIn("Unknown account: a", str(cm.exception))
+
+        # An existing source position is not replaced
+        row = SourcePosition("accounts.csv", 3)
+        def unknown_account_row():
+            raise bberr.UnknownAccount("a", row)
+        with self.assertRaises(bberr.UnknownAccount) as cm:
+            add_source_position(source)(unknown_account_row)()
+        self.assertIs(cm.exception.source, row)
+
+    def test_number_invalid_message(self):
+        for e in [bberr.AssetsNumberInvalid, bberr.LiabilitiesNumberInvalid, bberr.EquityNumberInvalid,
+                  bberr.IncomeNumberInvalid, bberr.ExpensesNumberInvalid]:
+            self.assertTrue(str(e(42)).startswith("Invalid account number: 42."))
+
+    def test_duplicates_preview(self):
+        e = bberr.AccountNumberNotUnique(list(range(1000, 1025)))
+        self.assertIn("1019] ...and 5 more", str(e))
+        self.assertEqual(len(e.numbers), 25)
+        self.assertIn("['a', 'b']", str(bberr.AccountIdentifierNotUnique(["a", "b"])))
+
+    def test_balance_assertion_failed(self):
+        e = bberr.BalanceAssertionFailed(None, "a", 1005, -3)
+        self.assertIn("Statement balance: 10.05\nComputed balance: -0.03\nDifference: -10.08", str(e))
+        self.assertEqual(e.difference, -10.08)
+
+    def test_copy_and_pickle(self):
+        source = SourcePosition("accounts.csv", 3)
+        for e in [bberr.UnknownAccount("a", source), bberr.JournalNotLoaded(),
+                  bberr.MissingRequiredColumn(["a", "b"]), bberr.BalanceAssertionFailed(None, "a", 1005, -3)]:
+            for e2 in [copy.copy(e), pickle.loads(pickle.dumps(e))]:
+                self.assertIs(type(e2), type(e))
+                self.assertEqual(str(e2), str(e))
+
+    def test_args_and_message(self):
+        e = bberr.UnknownAccount("a")
+        self.assertEqual(e.args, ("Unknown account: a",))
+        e.message = "Unknown account: b"
+        self.assertEqual(str(e), "Unknown account: b")
+        e.args = ("Unknown account: c",)
+        self.assertEqual(e.message, "Unknown account: c")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from balancebook.journal.config import load_config
 from balancebook.balance import Balance
 from balancebook.journal.journal import Journal
 from balancebook.transaction import Txn, Posting
+import balancebook.errors as bberr
 
 class TestTxn(unittest.TestCase):
     def setUp(self) -> None:
@@ -124,5 +125,15 @@ class TestTxn(unittest.TestCase):
         except Exception as e:
             self.fail("verify_balances raised Exception: " + str(e))        
 
+    def test_verify_balances_failed(self):
+        # The computed balance includes the subaccounts (Project North)
+        acc = self.journal.get_account_by_ident("Chequing")
+        self.journal.add_balances([Balance(date(2023, 9, 30), acc, 500000)])
+        with self.assertRaises(bberr.BalanceAssertionFailed) as cm:
+            self.journal.verify_balances()
+        self.assertEqual(cm.exception.account, "Chequing")
+        self.assertEqual(cm.exception.statement_balance, 5000)
+        self.assertEqual(cm.exception.computed_balance, 3000)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file